@@ -1,17 +1,37 @@
 import os
+import shutil
 import uuid
+from typing import List
 
-from fastapi import APIRouter, File, Query, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 
 from app.core.config import UPLOADS_DIR
 from app.core.rq_client import queue
-from app.services.document_indexing import chunk
-from app.services.question_generation.mcq import search_and_ask
+
+# Jobs are enqueued by dotted path so the API never imports LangChain, Qdrant,
+# Ollama or OpenAI; only the RQ workers load these modules.
+CHUNK_JOB = "app.services.document_indexing.chunk"
+SEARCH_AND_ASK_JOB = "app.services.question_generation.mcq.search_and_ask"
 
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
 router = APIRouter()
 
+MAX_BATCH_FILES = 50
+
+
+def _save_upload(file: UploadFile) -> str:
+    filename = (file.filename or "upload.pdf").replace("\\", "_").replace("/", "_")
+    if not filename.lower().endswith(".pdf"):
+        filename = f"{filename}.pdf"
+    save_path = os.path.join(UPLOADS_DIR, f"{uuid.uuid4().hex}_{filename}")
+
+    # stream to disk instead of holding the whole PDF in memory
+    with open(save_path, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+    return save_path
+
+
 @router.post('/chunking')
 def chunking(
         doc_path: str | None = Query(None, description="(Legacy) Path to local PDF or folder"),
@@ -20,24 +40,50 @@ def chunking(
     collection_name = f"edu_mate_{uuid.uuid4().hex}"
 
     if file is not None:
-        filename = (file.filename or "upload.pdf").replace("\\", "_").replace("/", "_")
-        if not filename.lower().endswith(".pdf"):
-            filename = f"{filename}.pdf"
-        save_path = os.path.join(UPLOADS_DIR, f"{uuid.uuid4().hex}_{filename}")
-
-        with open(save_path, "wb") as f:
-            f.write(file.file.read())
-
-        job = queue.enqueue(chunk, [save_path], collection_name, job_timeout = 600)
+        save_path = _save_upload(file)
+        job = queue.enqueue(CHUNK_JOB, [save_path], collection_name, job_timeout = 600)
         return {"status": "queued", "job_id": job.id, "collection_name": collection_name}
 
     if doc_path:
-        job = queue.enqueue(chunk, doc_path, collection_name)
+        job = queue.enqueue(CHUNK_JOB, doc_path, collection_name)
         return {"status": "queued", "job_id": job.id, "collection_name": collection_name}
 
     return {"status": "failed", "error": "Provide either 'file' (upload) or 'doc_path' (legacy)."}
 
 
+@router.post('/chunking/batch')
+def chunking_batch(
+        files: List[UploadFile] = File(..., description="PDFs to index together into one collection"),
+):
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_FILES} files per batch")
+
+    collection_name = f"edu_mate_{uuid.uuid4().hex}"
+
+    # progress and per-source counts are keyed by the uploaded name; repeated names get a suffix
+    source_names = {}
+    for file in files:
+        base = name = file.filename or "upload.pdf"
+        n = 1
+        while name in source_names.values():
+            n += 1
+            name = f"{base} ({n})"
+        source_names[_save_upload(file)] = name
+    save_paths = list(source_names)
+
+    # one job for the whole batch, so all chunks share embedding batches and one collection
+    job = queue.enqueue(
+        CHUNK_JOB, save_paths, collection_name, source_names,
+        job_timeout = max(600, 300 * len(save_paths)),
+    )
+    return {
+        "status": "queued",
+        "job_id": job.id,
+        "collection_name": collection_name,
+        "files": list(source_names.values()),
+    }
+
+
 @router.get('/chunking/status')
 def chunking_status(job_id : str):
     job = queue.fetch_job(job_id=job_id)
@@ -46,12 +92,12 @@ def chunking_status(job_id : str):
         return {"status" : None}
     
     if job.is_failed:
-        return {"status" : "failed", "error": str(job.exc_info)}
+        return {"status" : "failed", "error": str(job.exc_info), "progress": job.meta.get("progress")}
     
     if job.is_finished and job.result.get('stored'):
-        return {"status" : "chunked", "result": job.result}
+        return {"status" : "chunked", "result": job.result, "timings": job.meta.get("timings"), "progress": job.meta.get("progress")}
     
-    return { "status" : job.get_status()}
+    return { "status" : job.get_status(), "progress": job.meta.get("progress")}
 
 @router.post('/chat')
 def chat(
@@ -62,7 +108,7 @@ def chat(
         description="Bloom's taxonomy requirements string"
     ),
 ):
-    job = queue.enqueue(search_and_ask, query, collection_name, blooms_requirements, job_timeout = 600)
+    job = queue.enqueue(SEARCH_AND_ASK_JOB, query, collection_name, blooms_requirements, job_timeout = 600)
     return { "status" : "queued", "job_id" : job.id }
 
 
@@ -76,7 +122,7 @@ def get_result(
         return {"status" : None}
     
     if job.is_finished:
-        return { "status" : "finished", "result" : job.result }
+        return { "status" : "finished", "result" : job.result, "timings" : job.meta.get("timings"), "tokens" : job.meta.get("tokens") }
 
     if job.is_failed:
         return { "status" : "failed", "error" : str(job.exc_info) }
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics import render_metrics
+from app.core.rq_client import queue
+
+router = APIRouter()
+
+@router.get('/metrics')
+def metrics():
+    body, content_type = render_metrics(queue.connection)
+    return Response(content=body, media_type=content_type)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import assessments, auth, generation
+from app.api.v1.endpoints import assessments, auth, generation, metrics
 
 api_router = APIRouter()
 
@@ -7,4 +7,6 @@ api_router.include_router(auth.router, prefix='/api', tags=['auth'])
 
 api_router.include_router(assessments.router, prefix='/api/assessments', tags=['assessments'])
 
-api_router.include_router(generation.router, tags=["generation"])
\ No newline at end of file
+api_router.include_router(generation.router, tags=["generation"])
+
+api_router.include_router(metrics.router, tags=["metrics"])
\ No newline at end of file
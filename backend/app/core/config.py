@@ -1,8 +1,16 @@
+import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 BACKEND_DIR = Path(__file__).resolve().parents[2]
 PROJECT_DIR = BACKEND_DIR.parent
 
+# Load .env before any setting is read, so every process (API, RQ work horse)
+# sees the same values no matter which module imports config first or where it runs from.
+load_dotenv(BACKEND_DIR / ".env")
+load_dotenv(PROJECT_DIR / ".env")
+
 # --- SECURITY & JWT CONFIGURATION ---
 SECRET_KEY = "super_secret_edumate_key"  # Keep this safe!
 ALGORITHM = "HS256"
@@ -11,4 +19,14 @@ RESET_TOKEN_EXPIRE_MINUTES = 15     # 15 minutes to reset password
 
 FRONTEND_DIST_DIR = PROJECT_DIR / "frontend" / "dist"
 LEGACY_HTML_PATH = PROJECT_DIR / "index2.html"
-UPLOADS_DIR = PROJECT_DIR / "uploads"
\ No newline at end of file
+UPLOADS_DIR = PROJECT_DIR / "uploads"
+
+# --- EMBEDDINGS ---
+# "ollama" embeds over HTTP through the Ollama server, "onnx" runs the model in-process
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "ollama")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+# directory holding model.onnx (or model_quantized.onnx) and tokenizer.json
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", str(BACKEND_DIR / "models" / EMBEDDING_MODEL)))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))  # 0 lets onnxruntime use all cores
@@ -0,0 +1,114 @@
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
+from rq import Queue, get_current_job
+
+# Jobs may run in a short-lived process (rq forks a work horse per job), so stage
+# durations and token counts are aggregated in Redis and read back at scrape time.
+STAGE_SECONDS_KEY = "edumate:metrics:stage_seconds"
+LLM_TOKENS_KEY = "edumate:metrics:llm_tokens"
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _save_job_meta(job, key: str, name: str, value):
+    values = job.meta.setdefault(key, {})
+    values[name] = round(values.get(name, 0) + value, 4)
+    job.save_meta()
+
+
+def record_stage(name: str, seconds: float):
+    """Add a stage duration to the current RQ job's meta['timings'] and the Redis histogram."""
+    job = get_current_job()
+    if job is None:
+        return
+    _save_job_meta(job, "timings", name, seconds)
+
+    # per-bucket counts are stored non-cumulative and summed up at scrape time
+    bucket = next((b for b in STAGE_BUCKETS if seconds <= b), None)
+    pipe = job.connection.pipeline(transaction=False)
+    pipe.hincrby(STAGE_SECONDS_KEY, f"{name}:count", 1)
+    pipe.hincrbyfloat(STAGE_SECONDS_KEY, f"{name}:sum", seconds)
+    if bucket is not None:
+        pipe.hincrby(STAGE_SECONDS_KEY, f"{name}:le:{bucket}", 1)
+    pipe.execute()
+
+
+@contextmanager
+def stage(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def record_tokens(usage):
+    """Count prompt/completion tokens from an OpenAI-style `usage` object."""
+    job = get_current_job()
+    if usage is None or job is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None) or 0
+        _save_job_meta(job, "tokens", kind, tokens)
+        job.connection.hincrby(LLM_TOKENS_KEY, kind, tokens)
+
+
+def _decode_hash(values: dict) -> dict:
+    return {
+        (k.decode() if isinstance(k, bytes) else k): float(v)
+        for k, v in values.items()
+    }
+
+
+class JobMetricsCollector:
+    """Reports the stage histograms and token counters that jobs aggregated in Redis."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def collect(self):
+        stages = HistogramMetricFamily(
+            "edumate_stage_seconds", "Time spent in each indexing / generation stage", labels=["stage"]
+        )
+        values = _decode_hash(self.connection.hgetall(STAGE_SECONDS_KEY))
+        names = sorted({field.split(":", 1)[0] for field in values if field.endswith(":count")})
+        for name in names:
+            buckets, cumulative = [], 0.0
+            for bound in STAGE_BUCKETS:
+                cumulative += values.get(f"{name}:le:{bound}", 0.0)
+                buckets.append((floatToGoString(bound), cumulative))
+            buckets.append(("+Inf", values[f"{name}:count"]))
+            stages.add_metric([name], buckets, sum_value=values.get(f"{name}:sum", 0.0))
+        yield stages
+
+        tokens = CounterMetricFamily("edumate_llm_tokens", "Tokens used by LLM calls", labels=["kind"])
+        for kind, count in sorted(_decode_hash(self.connection.hgetall(LLM_TOKENS_KEY)).items()):
+            tokens.add_metric([kind], count)
+        yield tokens
+
+
+class QueueCollector:
+    """Reports queued / started job counts of every RQ queue at scrape time."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def collect(self):
+        queued = GaugeMetricFamily("edumate_queue_jobs", "Jobs waiting in each RQ queue", labels=["queue"])
+        started = GaugeMetricFamily("edumate_queue_started_jobs", "Jobs running in each RQ queue", labels=["queue"])
+        for q in Queue.all(connection=self.connection):
+            queued.add_metric([q.name], q.count)
+            started.add_metric([q.name], q.started_job_registry.count)
+        yield queued
+        yield started
+
+
+def render_metrics(connection) -> tuple[bytes, str]:
+    registry = CollectorRegistry()
+    registry.register(JobMetricsCollector(connection))
+    registry.register(QueueCollector(connection))
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,127 @@
+import json
+import mimetypes
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Build-time siblings written by frontend/scripts/compress.mjs, best first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# Vite's build manifest (build.manifest in vite.config.js) lists every content-hashed
+# output file exactly; files copied from public/ are not in it and must be revalidated
+VITE_MANIFEST = os.path.join(".vite", "manifest.json")
+
+# Fallback without a manifest: Vite's hashed output under assets/, e.g. assets/index-DiwrgTtp.js
+HASHED_ASSETS_DIR = "assets"
+HASHED_ASSET_RE = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+def accepted_encodings(headers: Headers) -> set[str]:
+    accepted, refused = set(), set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = params.strip()
+        if not name:
+            continue
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    refused.add(name)
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+
+    # "*" covers every encoding that is not listed with q=0, e.g. "br;q=0, *" still refuses br
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in PRECOMPRESSED)
+    return accepted - refused
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves .br/.gz siblings when the client accepts them,
+    marks hashed assets as immutable and answers If-None-Match with 304.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hashed_files = self.load_manifest()
+
+    def load_manifest(self) -> set[str] | None:
+        for directory in self.all_directories:
+            try:
+                with open(os.path.join(directory, VITE_MANIFEST)) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            files = set()
+            for chunk in manifest.values():
+                files.add(chunk["file"])
+                files.update(chunk.get("css", []))
+                files.update(chunk.get("assets", []))
+            return files
+        return None
+
+    def is_hashed_asset(self, full_path: str) -> bool:
+        for directory in self.all_directories:
+            relative = os.path.relpath(full_path, os.path.realpath(directory))
+            if relative.startswith(os.pardir):
+                continue
+            relative = relative.replace(os.sep, "/")
+            if self.hashed_files is not None:
+                return relative in self.hashed_files
+
+            parts = relative.split("/")
+            return len(parts) > 1 and parts[0] == HASHED_ASSETS_DIR and bool(HASHED_ASSET_RE.search(parts[-1]))
+        return False
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+
+        cache_control = IMMUTABLE_CACHE if self.is_hashed_asset(full_path) else REVALIDATE_CACHE
+        headers = {"Cache-Control": cache_control}
+
+        has_siblings = False
+        served_path, served_stat = full_path, stat_result
+        accepted = accepted_encodings(request_headers)
+        for encoding, suffix in PRECOMPRESSED:
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            has_siblings = True
+            if served_path == full_path and encoding in accepted:
+                served_path, served_stat = full_path + suffix, sibling_stat
+                headers["Content-Encoding"] = encoding
+
+        if has_siblings:
+            headers["Vary"] = "Accept-Encoding"
+
+        # FileResponse derives the ETag from the served file, so each encoding gets its own
+        response = FileResponse(
+            served_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=served_stat,
+        )
+        if status_code == 200 and self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
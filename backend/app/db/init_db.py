@@ -0,0 +1,12 @@
+from app.db.database import Base, engine
+import app.models
+
+
+def init_db():
+    # Register database tables if they do not already exists
+    Base.metadata.create_all(bind=engine)
+
+
+if __name__ == "__main__":
+    init_db()
+    print("Database tables are ready.")
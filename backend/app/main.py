@@ -1,25 +1,22 @@
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.router import api_router
 from app.core.config import FRONTEND_DIST_DIR, LEGACY_HTML_PATH
-from app.db.database import Base, engine
-import app.models
+from app.core.static_files import PrecompressedStaticFiles
 
 app = FastAPI(title='EduMate API')
 
-# Register database tables if they do not already exists
-Base.metadata.create_all(bind=engine)
+# Database tables are created out of band: python -m app.db.init_db
 
 # Add all auth, assessments, PDF, generation endpoints
 app.include_router(api_router)
 
-# Serve the built React Frontend in production
+# Serve the built React Frontend in production (precompressed, cache-busted assets)
 if (FRONTEND_DIST_DIR / "index.html").is_file():
     app.mount(
         "/",
-        StaticFiles(directory=str(FRONTEND_DIST_DIR), html=True),
+        PrecompressedStaticFiles(directory=str(FRONTEND_DIST_DIR), html=True),
         name="frontend",
     )
 else:
@@ -2,12 +2,19 @@ import sys
 import glob
 from pathlib import Path
 import argparse
+import time
 
 from langchain_community.document_loaders import PyPDFLoader
 from pathlib import Path
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_ollama import OllamaEmbeddings
 from langchain_qdrant import QdrantVectorStore
+from rq import get_current_job
+
+from app.core.metrics import record_stage, stage
+from app.services.embeddings import TimedEmbeddings, embedding_vector_name, get_embedding_model
+
+# chunks embedded + upserted per Qdrant call, shared across files of one job
+INDEX_BATCH_SIZE = 256
 
 
 def find_pdfs(inputs):
@@ -39,26 +46,43 @@ def find_pdfs(inputs):
             out.append(rp)
     return out
 
+def load_pdf(pdf):
+    print("Loading ", pdf)
+    loader = PyPDFLoader(str(pdf))
+    loaded = loader.load()
+    if not loaded:
+        print(f"Warning: {pdf} loaded 0 pages (no extractable text).", file=sys.stderr)
+    for d in loaded:
+        d.metadata = d.metadata or {}
+        d.metadata['source'] = str(pdf)
+    return loaded
+
 def load_all(pdfs):
     docs = []
     for pdf in pdfs:
         try:
-            print("Loading ", pdf)
-            loader = PyPDFLoader(str(pdf))
-            loaded = loader.load()
-            if not loaded:
-                print(f"Warning: {pdf} loaded 0 pages (no extractable text).", file=sys.stderr)
-            for d in loaded:
-                d.metadata = d.metadata or {}
-                d.metadata['source'] = str(pdf)
-            docs.extend(loaded)
+            docs.extend(load_pdf(pdf))
         except Exception as e:
             print(f"Error Loading {pdf}: {e}", file=sys.stderr)
     
     return docs
 
 
-def chunk(doc_path, collection_name: str):
+def _report_progress(progress):
+    # lets /chunking/status show per-file and aggregate progress while the job runs
+    job = get_current_job()
+    if job is None:
+        return
+    job.meta["progress"] = progress
+    job.save_meta()
+
+
+def chunk(doc_path, collection_name: str, source_names: dict | None = None):
+    """
+    Index one or more PDFs into `collection_name`. `source_names` maps a saved
+    path to the name the client uploaded it as; progress and per-source chunk
+    counts are reported under that name (the path itself when not given).
+    """
     # parser = argparse.ArgumentParser(description='Simple PDF to Qdrant indexer')
     # parser.add_argument("inputs", nargs="+", help="PDF files, directories, or glob patterns")
     # agrs = parser.parse_args()
@@ -68,39 +92,104 @@ def chunk(doc_path, collection_name: str):
     if not pdf_paths:
         print("No PDFs found..", file=sys.stderr)
         sys.exit(1)
-    
-    docs = load_all(pdf_paths)
-    print(f"Loaded {len(docs)} documents (pages). Splitting documents into chunks....")
-
 
     # Split the docs into smaller chunks
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size = 2000,
         chunk_overlap = 500
     )
-    chunks = text_splitter.split_documents(documents=docs)
 
+    # Vector Embeddings (Ollama over HTTP or in-process ONNX, see app.services.embeddings)
+    embedding_model = TimedEmbeddings(get_embedding_model())
+
+    source_names = {str(Path(p).resolve()): name for p, name in (source_names or {}).items()}
+    names = {str(p): source_names.get(str(p), str(p)) for p in pdf_paths}
+    files = {names[str(p)]: {"status": "pending", "pages": 0, "chunks": 0, "indexed": 0} for p in pdf_paths}
+    progress = {
+        "files": files,
+        "files_total": len(files),
+        "files_done": 0,
+        "chunks_total": 0,
+        "chunks_indexed": 0,
+    }
+    _report_progress(progress)
+
+    vector_store = None
+    index_seconds = 0.0
+
+    def index_batch(batch):
+        nonlocal vector_store, index_seconds
+        start = time.perf_counter()
+        if vector_store is None:
+            vector_store = QdrantVectorStore.from_documents(
+                documents=batch,
+                embedding=embedding_model,
+                url='http://localhost:6333',
+                collection_name=collection_name,
+                vector_name=embedding_vector_name(),
+            )
+        else:
+            vector_store.add_documents(batch)
+        index_seconds += time.perf_counter() - start
+
+        for c in batch:
+            files[names[c.metadata['source']]]["indexed"] += 1
+        progress["chunks_indexed"] += len(batch)
+        for f in files.values():
+            if f["status"] == "split" and f["indexed"] == f["chunks"]:
+                f["status"] = "indexed"
+                progress["files_done"] += 1
+        _report_progress(progress)
+
+    # Files are loaded and split one at a time; their chunks share embedding batches,
+    # so a course of many small chapters is indexed in a few large calls.
+    pending = []
+    for pdf in pdf_paths:
+        name = names[str(pdf)]
+        try:
+            with stage("pdf_load"):
+                docs = load_pdf(pdf)
+        except Exception as e:
+            print(f"Error Loading {pdf}: {e}", file=sys.stderr)
+            files[name].update(status="failed", error=str(e))
+            progress["files_done"] += 1
+            _report_progress(progress)
+            continue
 
-    # Vector Embeddings
-    embedding_model = OllamaEmbeddings(
-        model='nomic-embed-text',
-        # model='qwen3-embedding:0.6b',
-        base_url='http://localhost:11434'
-    )
+        with stage("split"):
+            file_chunks = text_splitter.split_documents(documents=docs)
+        print(f"Loaded {len(docs)} pages / {len(file_chunks)} chunks from {pdf}")
+
+        files[name].update(
+            status="split" if file_chunks else "empty", pages=len(docs), chunks=len(file_chunks)
+        )
+        if not file_chunks:
+            progress["files_done"] += 1
+        progress["chunks_total"] += len(file_chunks)
+        _report_progress(progress)
+
+        pending.extend(file_chunks)
+        while len(pending) >= INDEX_BATCH_SIZE:
+            index_batch(pending[:INDEX_BATCH_SIZE])
+            pending = pending[INDEX_BATCH_SIZE:]
+
+    if pending:
+        index_batch(pending)
+
+    if vector_store is None:
+        raise ValueError("No text could be extracted from the uploaded PDFs.")
 
-    vector_store = QdrantVectorStore.from_documents(
-        documents=chunks,
-        embedding=embedding_model,
-        url='http://localhost:6333',
-        collection_name=collection_name,
-    )   
+    # from_documents/add_documents embed and upsert in one go; embedding time is already recorded as "embed"
+    record_stage("upsert", index_seconds - embedding_model.seconds)
 
     print("Indexing of documents done....")
 
     return {
         "stored": True,
-        "chunks": len(chunks),
+        "chunks": progress["chunks_total"],
         "source": str(pdf_paths[0]),
+        "sources": {name: f["chunks"] for name, f in files.items()},
+        "failed": {name: f["error"] for name, f in files.items() if f["status"] == "failed"},
         "collection_name": collection_name,
     }
 
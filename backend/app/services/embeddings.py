@@ -0,0 +1,141 @@
+import time
+from pathlib import Path
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MODEL,
+    EMBEDDING_THREADS,
+    OLLAMA_BASE_URL,
+    ONNX_MODEL_DIR,
+)
+from app.core.metrics import record_stage
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    In-process embeddings for nomic-embed-text-class models exported to ONNX.
+    Needs the optional `onnx` extra (onnxruntime, tokenizers, numpy).
+    """
+
+    def __init__(self, model_dir: Path, batch_size: int = 32, num_threads: int = 0, max_length: int = 2048):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        # prefer the quantized export when both are present
+        model_path = model_dir / "model_quantized.onnx"
+        if not model_path.is_file():
+            model_path = model_dir / "model.onnx"
+        if not model_path.is_file():
+            raise FileNotFoundError(f"No model.onnx / model_quantized.onnx in {model_dir}")
+
+        self.model_file = model_path.stem
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        last_hidden_state = self.session.run(None, feeds)[0]
+
+        # mean pooling over real tokens, then L2 normalise (same as Ollama's /api/embed)
+        mask = attention_mask[..., None].astype(last_hidden_state.dtype)
+        pooled = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[i:i + self.batch_size]))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0]
+
+
+class TimedEmbeddings(Embeddings):
+    """Wraps an embedding model and records every call as the "embed" stage."""
+
+    def __init__(self, model: Embeddings):
+        self.model = model
+        self.seconds = 0.0
+
+    def _timed(self, func, arg):
+        start = time.perf_counter()
+        try:
+            return func(arg)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds += elapsed
+            record_stage("embed", elapsed)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._timed(self.model.embed_documents, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._timed(self.model.embed_query, text)
+
+
+_onnx_model = None
+
+
+def get_embedding_model() -> Embeddings:
+    """Embedding model for the configured EMBEDDING_BACKEND (must match at indexing and search time)."""
+    global _onnx_model
+
+    if EMBEDDING_BACKEND == "onnx":
+        # loading the session is expensive, keep one per process (see app.worker)
+        if _onnx_model is None:
+            _onnx_model = OnnxEmbeddings(
+                ONNX_MODEL_DIR,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                num_threads=EMBEDDING_THREADS,
+            )
+        return _onnx_model
+
+    if EMBEDDING_BACKEND != "ollama":
+        raise ValueError(f"Unknown EMBEDDING_BACKEND: {EMBEDDING_BACKEND!r}")
+
+    from langchain_ollama import OllamaEmbeddings
+
+    return OllamaEmbeddings(
+        model=EMBEDDING_MODEL,
+        # model='qwen3-embedding:0.6b',
+        base_url=OLLAMA_BASE_URL,
+    )
+
+
+def embedding_vector_name() -> str:
+    """
+    Qdrant vector name used as the model tag of a collection.
+    Ollama keeps the unnamed default vector so existing collections stay searchable;
+    ONNX vectors are stored under their own name, so searching a collection that was
+    indexed by the other backend fails loudly instead of returning unrelated chunks.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        model_file = get_embedding_model().model_file
+        return f"{EMBEDDING_MODEL}.{model_file}"
+    return ""
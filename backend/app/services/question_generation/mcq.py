@@ -1,13 +1,17 @@
+import json
 import os
-from openai import OpenAI
+from openai import ContentFilterFinishReasonError, LengthFinishReasonError, OpenAI
+from openai.types import CompletionUsage
 from langchain_qdrant import QdrantVectorStore
-from langchain_ollama import OllamaEmbeddings
 from ollama import Client
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 load_dotenv()
 
+from app.core.metrics import record_tokens, stage
+from app.services.embeddings import TimedEmbeddings, embedding_vector_name, get_embedding_model
+
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
 open_ai_client = OpenAI(
@@ -26,17 +30,14 @@ ollama_client = Client(
 
 # vector embeddings (must match the model used during chunking/indexing)
 def _embedding_model():
-    return OllamaEmbeddings(
-        model='nomic-embed-text',
-        # model='qwen3-embedding:0.6b',
-        base_url='http://localhost:11434',
-    )
+    return TimedEmbeddings(get_embedding_model())
 
 def _vector_db(collection_name: str):
     return QdrantVectorStore.from_existing_collection(
         url='http://localhost:6333',
         collection_name=collection_name,
         embedding=_embedding_model(),
+        vector_name=embedding_vector_name(),
     )
 
 class SingleMCQ(BaseModel):
@@ -51,6 +52,112 @@ class OutputFormat(BaseModel):
     mcqs : List[SingleMCQ]
 
 
+BLOOM_LEVELS = ("remember", "understand", "apply", "analyze", "evaluate", "create")
+
+# how many times only the missing/invalid questions are re-requested
+MAX_REPAIR_ATTEMPTS = 2
+
+
+def parse_blooms_requirements(blooms_requirements: str) -> Dict[str, int]:
+    """Turn "5 remember, 3 understand, ..." into {"remember": 5, "understand": 3, ...}."""
+    counts = {}
+    for part in blooms_requirements.split(","):
+        tokens = part.strip().lower().split()
+        if len(tokens) != 2 or not tokens[0].isdigit():
+            continue
+        n, level = int(tokens[0]), tokens[1]
+        if level in BLOOM_LEVELS and n > 0:
+            counts[level] = counts.get(level, 0) + n
+    return counts
+
+
+def format_blooms_requirements(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{counts[level]} {level}" for level in BLOOM_LEVELS if counts.get(level))
+
+
+# option labels the frontend shows in front of answer_options
+OPTION_LABELS = "ABCDEFGH"
+
+
+def _match_option(correct_answer: str, options: List[str]) -> Optional[str]:
+    """
+    Resolve correct_answer to one of the (stripped) options: the exact option text,
+    or a label such as "B" / "B)" / "B." that either prefixes an option ("B) ...",
+    "B. ...", as the frontend accepts) or is the position the frontend labels "B".
+    """
+    answer = correct_answer.strip()
+    if answer in options:
+        return answer
+
+    label = answer.rstrip(").").strip()
+    if not label:
+        return None
+    prefixed = [o for o in options if o.startswith(f"{label})") or o.startswith(f"{label}.")]
+    if len(prefixed) == 1:
+        return prefixed[0]
+    if not prefixed and len(label) == 1 and label.upper() in OPTION_LABELS:
+        index = OPTION_LABELS.index(label.upper())
+        if index < len(options):
+            return options[index]
+    return None
+
+
+def _invalid_reason(mcq: SingleMCQ) -> Optional[str]:
+    if mcq.bloom_level.strip().lower() not in BLOOM_LEVELS:
+        return f"unknown bloom_level {mcq.bloom_level!r}"
+    if not mcq.question.strip():
+        return "empty question"
+    options = [o.strip() for o in mcq.answer_options]
+    if len(options) < 2 or any(not o for o in options):
+        return "needs at least two non-empty answer_options"
+    if len(set(options)) != len(options):
+        return "duplicate answer_options"
+    if _match_option(mcq.correct_answer, options) is None:
+        return "correct_answer does not match any of the answer_options"
+    return None
+
+
+def validate_mcqs(parsed: Optional[OutputFormat], required: Dict[str, int], already_accepted: List[SingleMCQ] = ()):
+    """
+    Compare the parsed output against the requested Bloom counts.
+    Returns (accepted, missing) where `missing` maps each level to the
+    number of questions that still have to be generated.
+    """
+    accepted = []
+    remaining = dict(required)
+    seen_questions = {m.question.strip().lower() for m in already_accepted}
+
+    for mcq in (parsed.mcqs if parsed else []):
+        reason = _invalid_reason(mcq)
+        if reason:
+            print(f"Rejected MCQ {mcq.question_no}: {reason}")
+            continue
+
+        level = mcq.bloom_level.strip().lower()
+        key = mcq.question.strip().lower()
+        if remaining.get(level, 0) <= 0 or key in seen_questions:
+            continue
+
+        # store the matched option text so the frontend's exact comparison finds it
+        mcq.bloom_level = level
+        mcq.answer_options = [o.strip() for o in mcq.answer_options]
+        mcq.correct_answer = _match_option(mcq.correct_answer, mcq.answer_options)
+        accepted.append(mcq)
+        seen_questions.add(key)
+        remaining[level] -= 1
+
+    missing = {level: n for level, n in remaining.items() if n > 0}
+    return accepted, missing
+
+
+def _merge_mcqs(accepted: List[SingleMCQ]) -> OutputFormat:
+    # keep the requested level order and renumber, since repaired questions arrive out of order
+    ordered = sorted(accepted, key=lambda m: BLOOM_LEVELS.index(m.bloom_level))
+    for i, mcq in enumerate(ordered, start=1):
+        mcq.question_no = str(i)
+    return OutputFormat(mcqs=ordered)
+
+
 def prompt_modelling(context, blooms_requirements: str):
     SYSTEM_PROMPT = f"""
         You are a Subject Matter Expert designing a professional, standalone exam. 
@@ -73,31 +180,97 @@ def prompt_modelling(context, blooms_requirements: str):
     """
     return SYSTEM_PROMPT  
 
+
+def repair_prompt(accepted: List[SingleMCQ], missing: Dict[str, int]) -> str:
+    existing = "\n".join(f"- {m.question}" for m in accepted) or "- (none)"
+    return f"""
+        Some questions were missing or invalid. Generate ONLY these additional questions: {format_blooms_requirements(missing)}.
+        Every `correct_answer` must be copied exactly from its `answer_options`, and options must be distinct.
+        Do not repeat any of these already accepted questions:
+        {existing}
+    """
+
+
+def _parse_items(content: Optional[str]) -> Optional[OutputFormat]:
+    """Fallback when the reply as a whole breaks the schema: keep every MCQ that parses on its own."""
+    try:
+        data = json.loads(content or "")
+    except ValueError:
+        return None
+    items = data.get("mcqs") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return None
+
+    mcqs = []
+    for item in items:
+        try:
+            mcqs.append(SingleMCQ.model_validate(item))
+        except ValidationError as e:
+            print(f"Rejected malformed MCQ: {e.errors()[0]['msg']}")
+    return OutputFormat(mcqs=mcqs)
+
+
+def _generate(system_prompt: str, user_query: str) -> Optional[OutputFormat]:
+    """
+    One structured-output call. Never raises on a malformed reply: returns only the
+    questions that parse (or None), so the caller re-requests the rest.
+    """
+    with stage("llm"):
+        # raw response first, so the JSON is still available if parsing fails
+        raw = open_ai_client.chat.completions.with_raw_response.parse(
+            model='gemini-2.5-flash-lite',
+            response_format= OutputFormat,
+            messages=[
+            {"role":"system", "content" : system_prompt},
+            {"role":"user", "content":user_query},
+        ],
+        )
+
+    try:
+        response = raw.parse()
+    except (ValidationError, LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+        print(f"Structured output did not validate ({type(e).__name__}), keeping the valid items")
+        try:
+            body = json.loads(raw.http_response.text)
+            choice = body["choices"][0]
+        except (ValueError, KeyError, IndexError):
+            return None
+        if body.get("usage"):
+            record_tokens(CompletionUsage.model_validate(body["usage"]))
+        return _parse_items(choice.get("message", {}).get("content"))
+
+    record_tokens(response.usage)
+    return response.choices[0].message.parsed
+
+
 def search_and_ask(user_query, collection_name: str, blooms_requirements: str = "5 remember, 3 understand, 4 apply, 3 analyze, 2 evaluate, 3 create", top_k = 5):
 
-    vector_db = _vector_db(collection_name=collection_name)
-    search_results = vector_db.similarity_search(query=user_query, k=top_k)
+    with stage("qdrant_connect"):
+        vector_db = _vector_db(collection_name=collection_name)
+    with stage("retrieve"):
+        search_results = vector_db.similarity_search(query=user_query, k=top_k)
 
     if not search_results:
         print("No search result from vector DB.")
         return
 
-    context_blocks = []
-    for result in search_results:
-        block = (
-            f"--- ADMIN METADATA (DO NOT MENTION IN OUTPUT) ---\n"
-            f"Source: {result.metadata['source']}\n"
-            f"Page: {result.metadata['page_label']}\n"
-            f"--- EDUCATIONAL CONTENT ---\n"
-            f"{result.page_content}\n"
-        )
-        context_blocks.append(block)
+    with stage("prompt_build"):
+        context_blocks = []
+        for result in search_results:
+            block = (
+                f"--- ADMIN METADATA (DO NOT MENTION IN OUTPUT) ---\n"
+                f"Source: {result.metadata['source']}\n"
+                f"Page: {result.metadata['page_label']}\n"
+                f"--- EDUCATIONAL CONTENT ---\n"
+                f"{result.page_content}\n"
+            )
+            context_blocks.append(block)
         
-    context = "\n\n".join(context_blocks)
+        context = "\n\n".join(context_blocks)
         
     
-    print(f'\n\n{context}\n\n')
-    SYSTEM_PROMPT = prompt_modelling(context, blooms_requirements)
+        print(f'\n\n{context}\n\n')
+        SYSTEM_PROMPT = prompt_modelling(context, blooms_requirements)
 
     # response = ollama_client.chat(
     #     model='llama3.2:1b',
@@ -116,22 +289,35 @@ def search_and_ask(user_query, collection_name: str, blooms_requirements: str =
 
     # print(response.message.content)
 
-    response = open_ai_client.chat.completions.parse(
-        model='gemini-2.5-flash-lite',
-        response_format= OutputFormat,
-        messages=[
-        {"role":"system", "content" : SYSTEM_PROMPT},
-        {"role":"user", "content":user_query},
-    ],
-    )
+    required = parse_blooms_requirements(blooms_requirements)
+    parsed = _generate(SYSTEM_PROMPT, user_query)
+
+    if not required:
+        # unparseable requirements string: nothing to validate against
+        return parsed.model_dump() if hasattr(parsed, "model_dump") else parsed
+
+    accepted, missing = validate_mcqs(parsed, required)
+
+    # Re-request only the missing/invalid questions and merge them into the accepted ones
+    for attempt in range(MAX_REPAIR_ATTEMPTS):
+        if not missing:
+            break
+        print(f"Repair attempt {attempt + 1}: requesting {format_blooms_requirements(missing)}")
+        repaired = _generate(
+            prompt_modelling(context, format_blooms_requirements(missing)) + repair_prompt(accepted, missing),
+            user_query,
+        )
+        extra, missing = validate_mcqs(repaired, missing, accepted)
+        accepted.extend(extra)
+
+    if missing:
+        print(f"Still missing after repair: {format_blooms_requirements(missing)}")
 
-    # print(f'🤖 : {response.choices[0].message.content}')
-    # return response.choices[0].message.content
-     
-    # print(f'🤖 : {response.choices[0].message.parsed}')
-    parsed = response.choices[0].message.parsed
     # Ensure RQ/FastAPI can JSON-serialize result
-    return parsed.model_dump() if hasattr(parsed, "model_dump") else parsed
+    result = _merge_mcqs(accepted).model_dump()
+    # unmet Bloom counts per level, empty when everything requested was generated
+    result["missing"] = missing
+    return result
 
 # if __name__ == "__main__":
 #     q = input("👉 Ask something... ")
@@ -0,0 +1,34 @@
+"""
+RQ worker for the indexing and question generation jobs.
+
+Run from the backend directory:
+
+    python -m app.worker
+
+`rq worker` forks a new work horse for every job, which would reload the ONNX
+embedding model each time. This worker runs jobs in its own process instead
+(rq's SimpleWorker) and loads the model once at startup. The model is loaded
+here rather than in a parent process that forks, since onnxruntime's thread
+pools do not survive a fork.
+"""
+import argparse
+
+from rq import SimpleWorker
+
+from app.core.rq_client import queue
+from app.services.embeddings import get_embedding_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduMate RQ worker")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args()
+
+    get_embedding_model()
+
+    worker = SimpleWorker([queue], connection=queue.connection)
+    worker.work(burst=args.burst)
+
+
+if __name__ == "__main__":
+    main()
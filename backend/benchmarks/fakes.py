@@ -0,0 +1,213 @@
+"""
+Local stand-ins for the services EduMate talks to (Ollama, Qdrant, Gemini, Redis/RQ),
+so the benchmarks run offline and deterministically.
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+EMBEDDING_SIZE = 768  # same as nomic-embed-text
+
+
+def fake_embedding_model():
+    # same text -> same vector, across runs and processes
+    return DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+
+class LocalQdrantVectorStore(QdrantVectorStore):
+    """QdrantVectorStore backed by one shared in-memory (local mode) Qdrant client."""
+
+    client_instance = QdrantClient(location=":memory:")
+
+    @classmethod
+    def from_documents(cls, documents, embedding, collection_name, vector_name="", **kwargs):
+        params = VectorParams(size=EMBEDDING_SIZE, distance=Distance.COSINE)
+        cls.client_instance.create_collection(
+            collection_name=collection_name,
+            vectors_config={vector_name: params} if vector_name else params,
+        )
+        store = cls.from_existing_collection(collection_name, embedding, vector_name=vector_name)
+        store.add_documents(documents)
+        return store
+
+    @classmethod
+    def from_existing_collection(cls, collection_name, embedding, vector_name="", **kwargs):
+        return cls(
+            client=cls.client_instance,
+            collection_name=collection_name,
+            embedding=embedding,
+            vector_name=vector_name,
+        )
+
+
+BLOOM_COUNTS_RE = re.compile(r"according to these counts: (.*?)\.\s*\n")
+
+
+class StubLLMServer:
+    """
+    Minimal OpenAI-compatible /chat/completions server answering with an OutputFormat
+    that matches the Bloom counts in the system prompt. `latency` simulates the model,
+    `invalid_rate` makes some answers fail validation to exercise the repair path.
+    """
+
+    def __init__(self, latency: float = 0.0, invalid_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _mcqs(self, system_prompt: str):
+        match = BLOOM_COUNTS_RE.search(system_prompt)
+        mcqs = []
+        for part in (match.group(1) if match else "").split(","):
+            tokens = part.strip().split()
+            if len(tokens) != 2 or not tokens[0].isdigit():
+                continue
+            for _ in range(int(tokens[0])):
+                options = [f"Option {c} {uuid.uuid4().hex[:6]}" for c in "ABCD"]
+                with self.lock:
+                    invalid = self.random.random() < self.invalid_rate
+                mcqs.append({
+                    "question_no": str(len(mcqs) + 1),
+                    "bloom_level": tokens[1],
+                    "question": f"Benchmark question {uuid.uuid4().hex}?",
+                    "answer_options": options,
+                    "correct_answer": "not an option" if invalid else options[0],
+                    "explaination": "Generated by the benchmark stub.",
+                })
+        return mcqs
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                system_prompt = next(
+                    (m["content"] for m in body["messages"] if m["role"] == "system"), ""
+                )
+                time.sleep(stub.latency)
+                with stub.lock:
+                    stub.calls += 1
+
+                content = json.dumps({"mcqs": stub._mcqs(system_prompt)})
+                payload = json.dumps({
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": len(system_prompt) // 4,
+                        "completion_tokens": len(content) // 4,
+                        "total_tokens": (len(system_prompt) + len(content)) // 4,
+                    },
+                }).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class InlineJob:
+    def __init__(self, func, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.func, self.args, self.kwargs = func, args, kwargs
+        self.meta = {}
+        self.result = None
+        self.exc_info = None
+        self.status = "queued"
+        self.seconds = None
+
+    @property
+    def is_finished(self):
+        return self.status == "finished"
+
+    @property
+    def is_failed(self):
+        return self.status == "failed"
+
+    def get_status(self):
+        return self.status
+
+    def run(self):
+        self.status = "started"
+        start = time.perf_counter()
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+            self.status = "finished"
+        except Exception as e:
+            self.exc_info = repr(e)
+            self.status = "failed"
+        finally:
+            self.seconds = time.perf_counter() - start
+
+
+class InlineQueue:
+    """
+    Stand-in for an RQ Queue + worker: jobs run on a local thread pool.
+    With workers=0 jobs are only recorded, like a Redis queue without a worker.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.name = "default"
+        self.jobs = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+
+    def __len__(self):
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def enqueue(self, func, *args, job_timeout=None, **kwargs):
+        if isinstance(func, str):
+            module, _, name = func.rpartition(".")
+            func = getattr(import_module(module), name)
+        job = InlineJob(func, args, kwargs)
+        self.jobs[job.id] = job
+        if self.executor:
+            self.executor.submit(job.run)
+        return job
+
+    def fetch_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=True)
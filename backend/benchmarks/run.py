@@ -0,0 +1,304 @@
+"""
+Offline benchmark for indexing, retrieval/generation, queued jobs and the HTTP endpoints.
+
+Run from the backend directory:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --pages 5 50 200 --llm-latency 0.5 --concurrency 16
+
+Ollama, Qdrant, Gemini and Redis are replaced by the stand-ins in benchmarks.fakes.
+Every run is appended to benchmarks/results/history.jsonl and compared with the previous one.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from openai import OpenAI
+
+# mcq.py builds its Gemini client at import time; the stub LLM replaces it later
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.api.v1.endpoints import generation
+from app.services import document_indexing
+from app.services.question_generation import mcq
+from benchmarks.fakes import (
+    InlineQueue,
+    LocalQdrantVectorStore,
+    StubLLMServer,
+    fake_embedding_model,
+)
+from benchmarks.sample_pdfs import make_pdf
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+HISTORY_FILE = RESULTS_DIR / "history.jsonl"
+
+QUERY = "Generate an assessment for this chapter"
+
+
+def peak_rss_mb() -> float:
+    # high-water mark of the whole benchmark process so far, not of the phase that just ran;
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if platform.system() == "Darwin" else rss / 1024
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def latency_summary(samples):
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def install_fakes(llm: StubLLMServer, uploads_dir: Path):
+    document_indexing.get_embedding_model = fake_embedding_model
+    document_indexing.QdrantVectorStore = LocalQdrantVectorStore
+    mcq.get_embedding_model = fake_embedding_model
+    mcq.QdrantVectorStore = LocalQdrantVectorStore
+    mcq.open_ai_client = OpenAI(base_url=llm.base_url, api_key="benchmark")
+    # keep /chunking uploads out of the project's uploads/ directory
+    generation.UPLOADS_DIR = uploads_dir
+
+
+def bench_indexing(pdfs):
+    results = {}
+    for pages, path in pdfs.items():
+        start = time.perf_counter()
+        out = document_indexing.chunk([str(path)], f"bench_{pages}p")
+        elapsed = time.perf_counter() - start
+        results[f"{pages}p"] = {
+            "pages": pages,
+            "chunks": out["chunks"],
+            "seconds": round(elapsed, 3),
+            "pages_per_sec": round(pages / elapsed, 2),
+            "chunks_per_sec": round(out["chunks"] / elapsed, 2),
+            "cumulative_peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+        print(f"  index {pages:>4} pages: {results[f'{pages}p']}")
+    return results
+
+
+def bench_retrieval(collection_name: str, queries: int, top_k: int = 5):
+    vector_db = mcq._vector_db(collection_name)
+    search = []
+    for i in range(queries):
+        start = time.perf_counter()
+        vector_db.similarity_search(query=f"{QUERY} {i}", k=top_k)
+        search.append(time.perf_counter() - start)
+
+    end_to_end = []
+    for i in range(max(1, queries // 5)):
+        start = time.perf_counter()
+        mcq.search_and_ask(f"{QUERY} {i}", collection_name)
+        end_to_end.append(time.perf_counter() - start)
+
+    return {
+        "similarity_search": latency_summary(search),
+        "search_and_ask": latency_summary(end_to_end),
+        "cumulative_peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def bench_jobs(collection_name: str, jobs: int, workers: int):
+    """Generation jobs drained by `workers` stand-in RQ workers, timed apart from the HTTP endpoints."""
+    queue = InlineQueue(workers=workers)
+    start = time.perf_counter()
+    for i in range(jobs):
+        queue.enqueue(mcq.search_and_ask, f"{QUERY} {i}", collection_name)
+    queue.shutdown()
+    elapsed = time.perf_counter() - start
+
+    summary = latency_summary([job.seconds for job in queue.jobs.values()])
+    summary["jobs_per_sec"] = round(jobs / elapsed, 2)
+    summary["failed"] = sum(1 for job in queue.jobs.values() if job.is_failed)
+    summary["cumulative_peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return summary
+
+
+class ApiServer:
+    def __init__(self, app: FastAPI):
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        sock = self.server.servers[0].sockets[0]
+        host, port = sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def _load(base_url: str, requests: int, concurrency: int, send):
+    local = threading.local()
+
+    def one(i):
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(base_url=base_url, timeout=60)
+        start = time.perf_counter()
+        response = send(local.client, i)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    summary = latency_summary(samples)
+    summary["requests_per_sec"] = round(requests / elapsed, 2)
+    return summary
+
+
+def bench_endpoints(collection_name: str, upload_pdf: Path, requests: int, concurrency: int):
+    # jobs are only recorded, so no worker competes with uvicorn for the CPU and the GIL;
+    # job execution is measured by bench_jobs
+    generation.queue = InlineQueue(workers=0)
+    app = FastAPI()
+    app.include_router(generation.router)
+
+    upload = upload_pdf.read_bytes()
+    results = {}
+    with ApiServer(app) as api:
+        results["POST /chat"] = _load(
+            api.base_url, requests, concurrency,
+            lambda c, i: c.post("/chat", params={"query": f"{QUERY} {i}", "collection_name": collection_name}),
+        )
+        job_ids = list(generation.queue.jobs)
+        results["GET /job_status"] = _load(
+            api.base_url, requests, concurrency,
+            lambda c, i: c.get("/job_status", params={"job_id": job_ids[i % len(job_ids)]}),
+        )
+        results["POST /chunking"] = _load(
+            api.base_url, max(1, requests // 10), concurrency,
+            lambda c, i: c.post("/chunking", files={"file": (upload_pdf.name, upload, "application/pdf")}),
+        )
+
+    for name, summary in results.items():
+        print(f"  {name:<16} {summary}")
+    results["cumulative_peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _flatten(data, prefix=""):
+    out = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            out[name] = value
+    return out
+
+
+def compare_with_previous(run: dict):
+    if not HISTORY_FILE.is_file():
+        return
+    lines = HISTORY_FILE.read_text().splitlines()
+    if not lines:
+        return
+
+    previous = json.loads(lines[-1])
+    before, after = _flatten(previous["results"]), _flatten(run["results"])
+    print(f"\nCompared with {previous['revision']} ({previous['timestamp']}):")
+    for key in sorted(after):
+        if key in before and before[key]:
+            change = (after[key] - before[key]) / before[key] * 100
+            print(f"  {key:<55} {before[key]:>10} -> {after[key]:>10} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline EduMate benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 50, 200], help="Sample PDF sizes")
+    parser.add_argument("--queries", type=int, default=20, help="Retrieval queries to time")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent HTTP clients")
+    parser.add_argument("--jobs", type=int, default=20, help="Generation jobs to run through the stand-in workers")
+    parser.add_argument("--workers", type=int, default=1, help="Stand-in RQ worker threads")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM latency in seconds")
+    parser.add_argument("--llm-invalid-rate", type=float, default=0.0, help="Share of invalid stub MCQs")
+    parser.add_argument("--no-save", action="store_true", help="Do not append to the history file")
+    args = parser.parse_args()
+
+    with StubLLMServer(args.llm_latency, args.llm_invalid_rate) as llm, tempfile.TemporaryDirectory() as tmp:
+        install_fakes(llm, Path(tmp))
+        pdfs = {pages: make_pdf(Path(tmp) / f"sample_{pages}p.pdf", pages) for pages in args.pages}
+
+        print("Indexing")
+        indexing = bench_indexing(pdfs)
+
+        collection_name = f"bench_{max(pdfs)}p"
+        print("Retrieval")
+        retrieval = bench_retrieval(collection_name, args.queries)
+        print(f"  {retrieval}")
+
+        print("Jobs")
+        jobs = bench_jobs(collection_name, args.jobs, args.workers)
+        print(f"  {jobs}")
+
+        print("Endpoints")
+        endpoints = bench_endpoints(collection_name, pdfs[min(pdfs)], args.requests, args.concurrency)
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "args": vars(args),
+        "results": {
+            "indexing": indexing,
+            "retrieval": retrieval,
+            "jobs": jobs,
+            "endpoints": endpoints,
+            "llm_calls": llm.calls,
+        },
+    }
+
+    compare_with_previous(run)
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        with HISTORY_FILE.open("a") as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"\nSaved to {HISTORY_FILE}")
+
+
+if __name__ == "__main__":
+    main()
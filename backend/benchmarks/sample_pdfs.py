@@ -0,0 +1,64 @@
+"""Generates text-only sample PDFs of a given page count, without extra dependencies."""
+import random
+from pathlib import Path
+
+WORDS = (
+    "photosynthesis energy cell membrane protein enzyme reaction molecule gradient "
+    "algorithm recursion complexity array pointer memory process thread network "
+    "democracy constitution economy market supply demand inflation history empire "
+    "velocity acceleration force momentum friction equilibrium circuit voltage current"
+).split()
+
+LINES_PER_PAGE = 48
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_text(rng: random.Random, page_no: int) -> bytes:
+    lines = [f"Chapter {page_no // 10 + 1}, section {page_no + 1}"]
+    for _ in range(LINES_PER_PAGE - 1):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 12))).capitalize() + ".")
+
+    ops = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+    ops += [f"({_escape(line)}) '" for line in lines]
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def make_pdf(path: Path, pages: int, seed: int = 0) -> Path:
+    rng = random.Random(seed + pages)
+    path = Path(path)
+
+    # object 1: catalog, 2: pages, 3: font, then (page, content) pairs
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for i in range(pages):
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(f"{page_id} 0 R")
+        stream = _page_text(rng, i)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    path.write_bytes(bytes(out))
+    return path
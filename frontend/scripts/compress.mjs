@@ -0,0 +1,33 @@
+// Writes .br and .gz siblings next to the built text assets so the backend can
+// serve them without compressing on every request (see backend/app/core/static_files.py).
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const DIST_DIR = fileURLToPath(new URL('../dist/', import.meta.url))
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|map|xml|wasm)$/
+const MIN_SIZE = 1024
+
+function* walk(dir) {
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name)
+    if (statSync(path).isDirectory()) yield* walk(path)
+    else yield path
+  }
+}
+
+let count = 0
+for (const path of walk(DIST_DIR)) {
+  if (!COMPRESSIBLE.test(path)) continue
+  const data = readFileSync(path)
+  if (data.length < MIN_SIZE) continue
+
+  writeFileSync(`${path}.br`, brotliCompressSync(data, {
+    params: { [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY },
+  }))
+  writeFileSync(`${path}.gz`, gzipSync(data, { level: 9 }))
+  count++
+}
+
+console.log(`Precompressed ${count} files in ${DIST_DIR}`)
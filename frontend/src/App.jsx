@@ -8,7 +8,7 @@ from './components/index'
 import { useAuth } from './context/AuthContext';
 import { useTheme } from './context/ThemeContext';
 
-import { uploadFile, pollChunkingStatus, generateAssessment, pollJobStatus, saveAssessment, fetchAssessmentHistory, fetchAssessmentDetail } from './api';
+import { uploadFile, uploadFiles, pollChunkingStatus, generateAssessment, pollJobStatus, saveAssessment, fetchAssessmentHistory, fetchAssessmentDetail } from './api';
 
 import {
   Loader2, Sparkles, BookOpen, AlertTriangle, ArrowLeft,
@@ -94,9 +94,9 @@ function Sidebar({ activeNav, setActiveNav, onReset, onOpenGuide }) {
 
 // ─── Page: Dashboard ──────────────────────────────────────────────────────────
 function DashboardPage({
-  appState, collectionName, uploadedFile, chapterName, setChapterName,
+  appState, collectionName, uploadedFiles, chapterName, setChapterName,
   bloomsLevels, totalQuestions, adjustLevel,
-  isProcessingFile, handleFileUpload, handleGenerate,
+  isProcessingFile, processingProgress, handleFileUpload, handleGenerate,
   assessmentData, resetApp, handleRegenerate, error, loadingMessage,
 }) {
   const { user } = useAuth();
@@ -135,10 +135,16 @@ function DashboardPage({
               <label className="block text-xs font-semibold text-white/40 uppercase tracking-widest mb-3">
                 Step 1 · Upload Material
               </label>
-              <FileUpload onFileUpload={handleFileUpload} externalFile={uploadedFile} />
+              <FileUpload onFileUpload={handleFileUpload} externalFiles={uploadedFiles} />
               {isProcessingFile && (
                 <p className="text-xs text-violet-400 mt-2 animate-pulse flex items-center gap-1">
                   <Loader2 className="w-3 h-3 animate-spin" /> Analyzing document structure…
+                  {processingProgress && processingProgress.files_total > 1 && (
+                    <span>
+                      {' '}{processingProgress.files_done}/{processingProgress.files_total} files
+                      {processingProgress.chunks_total > 0 && ` · ${processingProgress.chunks_indexed}/${processingProgress.chunks_total} chunks`}
+                    </span>
+                  )}
                 </p>
               )}
               {collectionName && !isProcessingFile && (
@@ -580,13 +586,14 @@ function Dashboard() {
   const { theme, toggleTheme } = useTheme();
   const [appState, setAppState]             = useState('SETUP');
   const [collectionName, setCollectionName] = useState(null);
-  const [uploadedFile, setUploadedFile] = useState(null);
+  const [uploadedFiles, setUploadedFiles] = useState(null);
   const [chapterName, setChapterName] = useState('');
   const [bloomsLevels, setBloomsLevels] = useState(DEFAULT_BLOOMS);
   const [assessmentData, setAssessmentData] = useState(null);
   const [error, setError] = useState(null);
   const [loadingMessage, setLoadingMessage] = useState('');
   const [isProcessingFile, setIsProcessingFile] = useState(false);
+  const [processingProgress, setProcessingProgress] = useState(null);
   const [activeNav, setActiveNav] = useState('dashboard');
   const [isGuideOpen, setIsGuideOpen] = useState(false);
 
@@ -601,18 +608,20 @@ function Dashboard() {
       .map(l => `${bloomsLevels[l.key]} ${l.key}`)
       .join(', ');
 
-  const handleFileUpload = async (file) => {
+  const handleFileUpload = async (files) => {
     try {
       setIsProcessingFile(true);
-      setUploadedFile(file);
-      const response = await uploadFile(file);
+      setProcessingProgress(null);
+      setUploadedFiles(files);
+      // several PDFs go through one batch job into a single collection
+      const response = files.length === 1 ? await uploadFile(files[0]) : await uploadFiles(files);
       if (response.status === 'queued') {
         setCollectionName(response.collection_name);
         pollChunking(response.job_id);
       } else throw new Error('Upload failed to queue.');
     } catch (err) {
       setError(err.message || 'Failed to upload file.');
-      setUploadedFile(null);
+      setUploadedFiles(null);
       setIsProcessingFile(false);
     }
   };
@@ -621,7 +630,13 @@ function Dashboard() {
     const iv = setInterval(async () => {
       try {
         const s = await pollChunkingStatus(jobId);
-        if (s.status === 'chunked') { clearInterval(iv); setIsProcessingFile(false); }
+        if (s.progress) setProcessingProgress(s.progress);
+        if (s.status === 'chunked') {
+          clearInterval(iv);
+          setIsProcessingFile(false);
+          const failed = Object.entries(s.result?.failed || {});
+          if (failed.length) setError(`Some files could not be read: ${failed.map(([name, err]) => `${name} (${err})`).join(', ')}`);
+        }
         else if (s.status === 'failed') { clearInterval(iv); setError(`Processing failed: ${s.error}`); setIsProcessingFile(false); }
       } catch { clearInterval(iv); setError('Network error while polling status.'); setIsProcessingFile(false); }
     }, 2000);
@@ -694,7 +709,8 @@ function Dashboard() {
   const resetApp = () => {
     setAppState('SETUP');
     setCollectionName(null);
-    setUploadedFile(null);
+    setUploadedFiles(null);
+    setProcessingProgress(null);
     setChapterName('');
     setBloomsLevels(DEFAULT_BLOOMS);
     setAssessmentData(null);
@@ -744,13 +760,14 @@ function Dashboard() {
                 key="dashboard-page"
                 appState={appState}
                 collectionName={collectionName}
-                uploadedFile={uploadedFile}
+                uploadedFiles={uploadedFiles}
                 chapterName={chapterName}
                 setChapterName={setChapterName}
                 bloomsLevels={bloomsLevels}
                 totalQuestions={totalQuestions}
                 adjustLevel={adjustLevel}
                 isProcessingFile={isProcessingFile}
+                processingProgress={processingProgress}
                 handleFileUpload={handleFileUpload}
                 handleGenerate={handleGenerate}
                 assessmentData={assessmentData}
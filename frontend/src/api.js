@@ -17,6 +17,18 @@ export const uploadFile = async (file) => {
     return response.data;
 };
 
+// Several PDFs indexed by one job into one collection; poll with pollChunkingStatus
+export const uploadFiles = async (files) => {
+    const formData = new FormData();
+    for (const file of files) {
+        formData.append('files', file);
+    }
+    const response = await axios.post(`${API_BASE_URL}/chunking/batch`, formData, {
+        headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+};
+
 export const pollChunkingStatus = async (jobId) => {
     const response = await axios.get(`${API_BASE_URL}/chunking/status`, {
         params: { job_id: jobId },
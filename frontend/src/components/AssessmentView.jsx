@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { motion } from 'framer-motion';
-import { Check, FileText, Key, ChevronDown, ChevronUp, Brain, Download } from 'lucide-react';
+import { Check, FileText, Key, ChevronDown, ChevronUp, Brain, Download, AlertTriangle } from 'lucide-react';
 import clsx from 'clsx';
 import {
     Document, Packer, Paragraph, TextRun, HeadingLevel,
@@ -294,6 +294,8 @@ const AssessmentView = ({ assessmentData }) => {
     }
 
     const { mcqs } = assessmentData;
+    // Bloom levels the generator could not fill, e.g. { apply: 2 }
+    const missing = Object.entries(assessmentData.missing || {}).filter(([, n]) => n > 0);
 
     const toggleExplanation = (index) => {
         setExpandedExplanations(prev => ({ ...prev, [index]: !prev[index] }));
@@ -363,6 +365,17 @@ const AssessmentView = ({ assessmentData }) => {
                 )}
             </div>
 
+            {/* ── Incomplete generation notice ── */}
+            {missing.length > 0 && (
+                <div className="flex items-start gap-3 mb-6 px-4 py-3 rounded-2xl border border-amber-500/30 bg-amber-500/10 text-amber-200 text-sm">
+                    <AlertTriangle size={16} className="mt-0.5 shrink-0" />
+                    <span>
+                        Some questions could not be generated:{' '}
+                        {missing.map(([level, n]) => `${n} ${level}`).join(', ')}. Try generating again for the full set.
+                    </span>
+                </div>
+            )}
+
             {/* ── Questions list ── */}
             <motion.div layout className="space-y-5">
                 {mcqs.map((mcq, index) => (
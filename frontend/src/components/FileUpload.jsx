@@ -2,14 +2,15 @@ import React, { useState } from 'react';
 import { Upload, CheckCircle, AlertCircle, Loader2, X, FileText } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 
-const FileUpload = ({ onFileUpload, externalFile }) => {
+const FileUpload = ({ onFileUpload, externalFiles }) => {
     const [dragActive, setDragActive] = useState(false);
-    const [internalFile, setInternalFile] = useState(null);
+    const [internalFiles, setInternalFiles] = useState([]);
     const [error, setError] = useState(null);
     const [uploading, setUploading] = useState(false);
 
-    // Use externalFile (App-level state) if available, else fall back to internal
-    const file = externalFile ?? internalFile;
+    // Use externalFiles (App-level state) if available, else fall back to internal
+    const files = externalFiles ?? internalFiles;
+    const totalSize = files.reduce((sum, f) => sum + f.size, 0);
 
     const handleDrag = (e) => {
         e.preventDefault();
@@ -18,41 +19,40 @@ const FileUpload = ({ onFileUpload, externalFile }) => {
         else if (e.type === 'dragleave') setDragActive(false);
     };
 
-    const validateFile = (f) => {
-        if (f.type !== 'application/pdf') { setError('Only PDF files are allowed'); return false; }
+    const validateFiles = (list) => {
+        if (list.some(f => f.type !== 'application/pdf')) { setError('Only PDF files are allowed'); return false; }
         setError(null);
         return true;
     };
 
+    const selectFiles = (fileList) => {
+        const list = Array.from(fileList || []);
+        if (list.length && validateFiles(list)) { setInternalFiles(list); handleUpload(list); }
+    };
+
     const handleDrop = (e) => {
         e.preventDefault();
         e.stopPropagation();
         setDragActive(false);
-        if (e.dataTransfer.files?.[0]) {
-            const f = e.dataTransfer.files[0];
-            if (validateFile(f)) { setInternalFile(f); handleUpload(f); }
-        }
+        selectFiles(e.dataTransfer.files);
     };
 
     const handleChange = (e) => {
         e.preventDefault();
-        if (e.target.files?.[0]) {
-            const f = e.target.files[0];
-            if (validateFile(f)) { setInternalFile(f); handleUpload(f); }
-        }
+        selectFiles(e.target.files);
     };
 
-    const handleUpload = async (selectedFile) => {
+    const handleUpload = async (selectedFiles) => {
         setUploading(true);
-        try { await onFileUpload(selectedFile); }
-        catch { setError('Upload failed. Please try again.'); setInternalFile(null); }
+        try { await onFileUpload(selectedFiles); }
+        catch { setError('Upload failed. Please try again.'); setInternalFiles([]); }
         finally { setUploading(false); }
     };
 
     const clearFile = (e) => {
         e.stopPropagation();
         e.preventDefault();
-        setInternalFile(null);
+        setInternalFiles([]);
         setError(null);
     };
 
@@ -69,6 +69,7 @@ const FileUpload = ({ onFileUpload, externalFile }) => {
                 className="absolute inset-0 w-full h-full opacity-0 cursor-pointer z-10"
                 onChange={handleChange}
                 accept=".pdf"
+                multiple
                 disabled={uploading}
             />
 
@@ -77,7 +78,7 @@ const FileUpload = ({ onFileUpload, externalFile }) => {
                 transition-all duration-300 min-h-[140px]
                 ${error
                     ? 'border-red-500/40 bg-red-500/5 text-red-400'
-                    : file
+                    : files.length > 0
                         ? 'border-emerald-500/40 bg-emerald-500/5 text-emerald-400'
                         : dragActive
                             ? 'border-violet-500/60 bg-violet-500/10 text-violet-300'
@@ -89,16 +90,25 @@ const FileUpload = ({ onFileUpload, externalFile }) => {
                         <motion.div key="uploading" initial={{ opacity: 0 }} animate={{ opacity: 1 }} exit={{ opacity: 0 }}
                             className="flex flex-col items-center gap-2">
                             <Loader2 className="w-10 h-10 animate-spin text-violet-400" />
-                            <p className="text-sm font-medium text-white/60">Uploading & processing PDF…</p>
+                            <p className="text-sm font-medium text-white/60">
+                                {files.length > 1 ? `Uploading & processing ${files.length} PDFs…` : 'Uploading & processing PDF…'}
+                            </p>
                         </motion.div>
-                    ) : file ? (
+                    ) : files.length > 0 ? (
                         <motion.div key="file" initial={{ opacity: 0, scale: 0.9 }} animate={{ opacity: 1, scale: 1 }} exit={{ opacity: 0 }}
                             className="flex flex-col items-center gap-2 w-full">
                             <div className="w-12 h-12 rounded-xl bg-emerald-500/20 flex items-center justify-center">
                                 <FileText className="w-6 h-6 text-emerald-400" />
                             </div>
-                            <p className="text-sm font-semibold text-emerald-300 truncate max-w-[260px]">{file.name}</p>
-                            <p className="text-xs text-white/40">{(file.size / 1024 / 1024).toFixed(2)} MB · PDF Document uploaded</p>
+                            <p className="text-sm font-semibold text-emerald-300 truncate max-w-[260px]">
+                                {files.length === 1 ? files[0].name : `${files.length} PDF documents`}
+                            </p>
+                            {files.length > 1 && (
+                                <p className="text-xs text-white/50 truncate max-w-[260px]">{files.map(f => f.name).join(', ')}</p>
+                            )}
+                            <p className="text-xs text-white/40">
+                                {(totalSize / 1024 / 1024).toFixed(2)} MB · {files.length === 1 ? 'PDF Document' : 'PDF Documents'} uploaded
+                            </p>
                             <button
                                 onClick={clearFile}
                                 className="z-20 mt-1 flex items-center gap-1 text-xs text-white/40 hover:text-red-400 transition-colors"
@@ -115,7 +125,7 @@ const FileUpload = ({ onFileUpload, externalFile }) => {
                             <p className="text-sm font-medium text-white/60">
                                 {error || 'Drag & drop or click to upload'}
                             </p>
-                            <p className="text-xs text-white/30">PDF only · Max 10 MB</p>
+                            <p className="text-xs text-white/30">PDF only · one or more files · Max 10 MB each</p>
                         </motion.div>
                     )}
                 </AnimatePresence>
@@ -4,6 +4,10 @@ import react from '@vitejs/plugin-react'
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react()],
+  build: {
+    // lets the backend mark exactly the content-hashed files as immutable
+    manifest: true,
+  },
   server: {
     proxy: {
       '/api': 'http://127.0.0.1:8000',